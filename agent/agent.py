@@ -47,8 +47,12 @@ from agent.tools import (
     initiate_video_call,
     end_video_call,
     get_available_contacts,
+    # Session prefetch
+    prefetch_session_data,
 )
 
+from agent.supabase_store import flush_pending_writes
+
 from agent.prompts import (
     ROOT_AGENT_INSTRUCTION
 )
@@ -78,7 +82,7 @@ def initialize_user_context(callback_context: CallbackContext):
     2. Supabase profile storage
     3. Default persona profile JSON
     """
-    from agent.supabase_store import get_profile, save_profile
+    from agent.supabase_store import get_cached_profile, save_profile
     
     # Get user_id from the invocation context (this is the actual user_id from the API call)
     # The session object contains the user_id that was used to create/retrieve it
@@ -107,7 +111,7 @@ def initialize_user_context(callback_context: CallbackContext):
         print(f"[AGENT] User changed from {stored_user_id} to {user_id}, reloading profile...")
     
     # Try loading from Supabase first
-    profile = get_profile(user_id)
+    profile = get_cached_profile(user_id)
 
     
     # Set user state with user: prefix for cross-session persistence
@@ -143,6 +147,11 @@ def initialize_user_context(callback_context: CallbackContext):
     callback_context.state["current_time"] = datetime.now().strftime("%Y-%m-%d %H:%M")
 
 
+def flush_pending_writes_callback(callback_context: CallbackContext):
+    """Flushes rows the tools queued for a batched insert during this turn."""
+    flush_pending_writes()
+
+
 async def auto_save_session_to_memory_callback(callback_context: CallbackContext):
     """
     Automatically saves the session contents to long-term memory
@@ -245,8 +254,8 @@ root_agent = Agent(
         search_tool,
     ],
     # Root agent uses multiple before/after callbacks
-    before_agent_callback=[initialize_user_context, opik_tracer.before_agent_callback],
-    after_agent_callback=[auto_save_session_to_memory_callback, opik_tracer.after_agent_callback],
+    before_agent_callback=[initialize_user_context, prefetch_session_data, opik_tracer.before_agent_callback],
+    after_agent_callback=[flush_pending_writes_callback, auto_save_session_to_memory_callback, opik_tracer.after_agent_callback],
     # Standard OPIK callbacks
     before_model_callback=opik_tracer.before_model_callback,
     after_model_callback=opik_tracer.after_model_callback,
@@ -432,9 +432,9 @@ async def run_agent(user_id: str, session_id: str, message: str, memory_context:
 
 # ==================== ENDPOINTS ====================
 
-@app.get("/")
+@app.api_route("/", methods=["GET", "HEAD"])
 async def health():
-    """Health check endpoint."""
+    """Health check endpoint. Also answers HEAD for body-less liveness probes."""
     return {"status": "ok", "agent": "amble"}
 
 
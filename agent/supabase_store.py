@@ -20,6 +20,8 @@ Mem0 is used ONLY for semantic memory search (agent context).
 """
 
 import os
+import time
+import threading
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -60,6 +62,56 @@ def _get_client():
     return get_supabase_client()
 
 
+# ==================== WRITE BUFFER ====================
+
+class _WriteBuffer:
+    """
+    Collects rows per table and inserts each table's rows in one request.
+    Pending rows are flushed after a short idle period or when flushed explicitly.
+    """
+    
+    def __init__(self, idle_seconds: float = 0.05):
+        self._idle_seconds = idle_seconds
+        self._rows: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        # Held across swap-and-insert so a reader's flush waits for an in-flight insert
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+    
+    def add(self, table: str, row: Dict[str, Any]) -> None:
+        """Queue a row for insertion and restart the idle timer."""
+        with self._lock:
+            self._rows.setdefault(table, []).append(row)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self._idle_seconds, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def flush(self) -> None:
+        """Insert all pending rows, one request per table."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._rows = self._rows, {}
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            
+            for table, rows in pending.items():
+                try:
+                    _get_client().table(table).insert(rows).execute()
+                except Exception as e:
+                    print(f"[WARN] Failed to flush {len(rows)} {table} row(s): {e}")
+
+
+_write_buffer = _WriteBuffer()
+
+
+def flush_pending_writes() -> None:
+    """Flush rows queued by buffered save_* calls."""
+    _write_buffer.flush()
+
+
 # ==================== USER MANAGEMENT ====================
 
 AVATAR_OPTIONS = {
@@ -100,6 +152,7 @@ def register_user(user_id: str, name: str, role: str = "elder", avatar: str = No
         client.table("user_profiles").upsert(
             profile_data, on_conflict="user_id"
         ).execute()
+        _invalidate_profile(user_id)
         
         return {
             "id": user_id,
@@ -189,6 +242,7 @@ def link_family_member(family_user_id: str, elder_id: str) -> bool:
             "preferences": prefs,
             "updated_at": datetime.now().isoformat()
         }).eq("user_id", family_user_id).execute()
+        _invalidate_profile(family_user_id)
         
         print(f"[OK] Linked family member {family_user_id} to elder {elder_id}")
         return True
@@ -213,6 +267,7 @@ def unlink_family_member(family_user_id: str) -> bool:
             "preferences": prefs,
             "updated_at": datetime.now().isoformat()
         }).eq("user_id", family_user_id).execute()
+        _invalidate_profile(family_user_id)
         
         return True
     except Exception as e:
@@ -338,6 +393,17 @@ def delete_session(user_id: str) -> bool:
 
 # ==================== PROFILE MANAGEMENT ====================
 
+# Short-lived profile cache (user_id -> (profile, expires_at)).
+# Profiles change rarely; every profile write in this module invalidates its entry.
+_PROFILE_CACHE_TTL = 30
+_PROFILE_CACHE_MAX = 1024
+_profile_cache: Dict[str, tuple] = {}
+
+def _invalidate_profile(user_id: str) -> None:
+    """Drop a cached profile after it has been written."""
+    _profile_cache.pop(user_id, None)
+
+
 def save_profile(user_id: str, profile: Dict[str, Any]) -> bool:
     """Save user profile to Supabase (user_profiles table)."""
     client = _get_client()
@@ -368,6 +434,7 @@ def save_profile(user_id: str, profile: Dict[str, Any]) -> bool:
             # Insert new
             client.table("user_profiles").insert(profile_data).execute()
         
+        _invalidate_profile(user_id)
         return True
     except Exception as e:
         print(f"[WARN] Failed to save profile: {e}")
@@ -399,12 +466,29 @@ def get_profile(user_id: str) -> Optional[Dict[str, Any]]:
     return None
 
 
+def get_cached_profile(user_id: str) -> Optional[Dict[str, Any]]:
+    """Get user profile, served from the in-process cache while it is fresh."""
+    entry = _profile_cache.get(user_id)
+    now = time.monotonic()
+    if entry and entry[1] > now:
+        return entry[0]
+    
+    profile = get_profile(user_id)
+    if profile is None:
+        # Missing or failed reads are not cached, so an error doesn't stick
+        return None
+    _profile_cache.pop(user_id, None)
+    if len(_profile_cache) >= _PROFILE_CACHE_MAX:
+        # Evict the oldest entry (dicts keep insertion order)
+        _profile_cache.pop(next(iter(_profile_cache), None), None)
+    _profile_cache[user_id] = (profile, now + _PROFILE_CACHE_TTL)
+    return profile
+
+
 # ==================== EXPENSE TRACKING ====================
 
-def save_expense(user_id: str, amount: float, category: str, description: str, date: str = None) -> bool:
-    """Save expense to Supabase."""
-    client = _get_client()
-    
+def save_expense(user_id: str, amount: float, category: str, description: str, date: str = None, buffered: bool = False) -> bool:
+    """Save expense to Supabase. With buffered=True the row is queued for a batched insert."""
     try:
         expense_data = {
             "user_id": user_id,
@@ -414,23 +498,33 @@ def save_expense(user_id: str, amount: float, category: str, description: str, d
             "date": date or datetime.now().date().isoformat(),
             "created_at": datetime.now().isoformat()
         }
-        client.table("expenses").insert(expense_data).execute()
+        if buffered:
+            _write_buffer.add("expenses", expense_data)
+        else:
+            _get_client().table("expenses").insert(expense_data).execute()
         return True
     except Exception as e:
         print(f"[WARN] Failed to save expense: {e}")
         return False
 
 
-def get_expenses(user_id: str, period: str = "all", limit: int = 50) -> List[Dict[str, Any]]:
-    """Get expenses for user from Supabase."""
+def get_expenses(user_id: str, period: str = "all", limit: int = 50, columns: str = "*", since: Optional[str] = None, until: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Get expenses for user from Supabase.
+    Pass columns to fetch only the fields needed, and since/until (ISO
+    timestamps) to select an explicit [since, until) range instead of period.
+    """
+    flush_pending_writes()
     client = _get_client()
     
     try:
-        query = client.table("expenses").select("*").eq("user_id", user_id)
+        query = client.table("expenses").select(columns).eq("user_id", user_id)
         
         # Filter by period
         now = datetime.now()
-        if period == "today":
+        if since:
+            query = query.gte("created_at", since)
+        elif period == "today":
             cutoff = now.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
             query = query.gte("created_at", cutoff)
         elif period == "week":
@@ -440,6 +534,9 @@ def get_expenses(user_id: str, period: str = "all", limit: int = 50) -> List[Dic
             cutoff = (now - timedelta(days=30)).isoformat()
             query = query.gte("created_at", cutoff)
         
+        if until:
+            query = query.lt("created_at", until)
+        
         result = query.order("created_at", desc=True).limit(limit).execute()
         return result.data if result.data else []
     except Exception as e:
@@ -449,10 +546,8 @@ def get_expenses(user_id: str, period: str = "all", limit: int = 50) -> List[Dic
 
 # ==================== ACTIVITY TRACKING ====================
 
-def save_activity(user_id: str, activity_type: str, description: str, duration_minutes: int = None) -> bool:
-    """Save activity to Supabase."""
-    client = _get_client()
-    
+def save_activity(user_id: str, activity_type: str, description: str, duration_minutes: int = None, buffered: bool = False) -> bool:
+    """Save activity to Supabase. With buffered=True the row is queued for a batched insert."""
     try:
         activity_data = {
             "user_id": user_id,
@@ -462,28 +557,41 @@ def save_activity(user_id: str, activity_type: str, description: str, duration_m
             "timestamp": datetime.now().isoformat(),
             "created_at": datetime.now().isoformat()
         }
-        client.table("activities").insert(activity_data).execute()
+        if buffered:
+            _write_buffer.add("activities", activity_data)
+        else:
+            _get_client().table("activities").insert(activity_data).execute()
         return True
     except Exception as e:
         print(f"[WARN] Failed to save activity: {e}")
         return False
 
 
-def get_activities(user_id: str, period: str = "all", limit: int = 50) -> List[Dict[str, Any]]:
-    """Get activities for user from Supabase."""
+def get_activities(user_id: str, period: str = "all", limit: int = 50, columns: str = "*", since: Optional[str] = None, until: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Get activities for user from Supabase.
+    Pass columns to fetch only the fields needed, and since/until (ISO
+    timestamps) to select an explicit [since, until) range instead of period.
+    """
+    flush_pending_writes()
     client = _get_client()
     
     try:
-        query = client.table("activities").select("*").eq("user_id", user_id)
+        query = client.table("activities").select(columns).eq("user_id", user_id)
         
         now = datetime.now()
-        if period == "today":
+        if since:
+            query = query.gte("timestamp", since)
+        elif period == "today":
             cutoff = now.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
             query = query.gte("timestamp", cutoff)
         elif period == "week":
             cutoff = (now - timedelta(days=7)).isoformat()
             query = query.gte("timestamp", cutoff)
         
+        if until:
+            query = query.lt("timestamp", until)
+        
         result = query.order("timestamp", desc=True).limit(limit).execute()
         return result.data if result.data else []
     except Exception as e:
@@ -493,10 +601,8 @@ def get_activities(user_id: str, period: str = "all", limit: int = 50) -> List[D
 
 # ==================== MOOD TRACKING ====================
 
-def save_mood(user_id: str, rating: str, notes: str = None, energy_level: int = None) -> bool:
-    """Save mood entry to Supabase."""
-    client = _get_client()
-    
+def save_mood(user_id: str, rating: str, notes: str = None, energy_level: int = None, buffered: bool = False) -> bool:
+    """Save mood entry to Supabase. With buffered=True the row is queued for a batched insert."""
     try:
         mood_data = {
             "user_id": user_id,
@@ -504,28 +610,41 @@ def save_mood(user_id: str, rating: str, notes: str = None, energy_level: int =
             "notes": notes,
             "timestamp": datetime.now().isoformat()
         }
-        client.table("moods").insert(mood_data).execute()
+        if buffered:
+            _write_buffer.add("moods", mood_data)
+        else:
+            _get_client().table("moods").insert(mood_data).execute()
         return True
     except Exception as e:
         print(f"[WARN] Failed to save mood: {e}")
         return False
 
 
-def get_moods(user_id: str, period: str = "all", limit: int = 20) -> List[Dict[str, Any]]:
-    """Get mood history for user from Supabase."""
+def get_moods(user_id: str, period: str = "all", limit: int = 20, columns: str = "*", since: Optional[str] = None, until: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Get mood history for user from Supabase.
+    Pass columns to fetch only the fields needed, and since/until (ISO
+    timestamps) to select an explicit [since, until) range instead of period.
+    """
+    flush_pending_writes()
     client = _get_client()
     
     try:
-        query = client.table("moods").select("*").eq("user_id", user_id)
+        query = client.table("moods").select(columns).eq("user_id", user_id)
         
         now = datetime.now()
-        if period == "today":
+        if since:
+            query = query.gte("timestamp", since)
+        elif period == "today":
             cutoff = now.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
             query = query.gte("timestamp", cutoff)
         elif period == "week":
             cutoff = (now - timedelta(days=7)).isoformat()
             query = query.gte("timestamp", cutoff)
         
+        if until:
+            query = query.lt("timestamp", until)
+        
         result = query.order("timestamp", desc=True).limit(limit).execute()
         return result.data if result.data else []
     except Exception as e:
@@ -724,12 +843,63 @@ def get_family_summary(elder_user_id: str) -> Dict[str, Any]:
         return {}
 
 
+# ==================== DAILY BUNDLE ====================
+
+# Set to False once PostgREST reports the function is missing (PGRST202);
+# other RPC errors fall back for that call only
+_daily_bundle_rpc_available = True
+
+def get_daily_bundle(user_id: str, since: Optional[str] = None, until: Optional[str] = None) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """
+    Get the totals inputs for get_daily_summary in one round trip.
+    
+    Returns only activities.duration_minutes, moods.rating and
+    expenses.amount, at most 50 newest rows each, in the [since, until)
+    range. Callers that need other fields should use get_activities,
+    get_moods or get_expenses instead.
+    
+    Requires the get_daily_bundle Postgres function from
+    supabase/get_daily_bundle.sql.
+    
+    Returns None when the RPC fails, so callers can fall back to the
+    separate queries. Only a missing function disables the RPC for the
+    rest of the process; other errors fall back for that call only.
+    """
+    global _daily_bundle_rpc_available
+    
+    if not _daily_bundle_rpc_available:
+        return None
+    
+    flush_pending_writes()
+    client = _get_client()
+    
+    try:
+        if since is None:
+            since = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+        params = {"p_user": user_id, "p_since": since, "p_until": until}
+        result = client.rpc("get_daily_bundle", params).execute()
+        bundle = result.data or {}
+        return {
+            "activities": bundle.get("activities") or [],
+            "moods": bundle.get("moods") or [],
+            "expenses": bundle.get("expenses") or [],
+        }
+    except Exception as e:
+        # PostgREST answers PGRST202 (HTTP 404) when the function is not deployed
+        if getattr(e, "code", None) == "PGRST202":
+            print("[INFO] get_daily_bundle function not found, using separate queries")
+            _daily_bundle_rpc_available = False
+        else:
+            print(f"[WARN] get_daily_bundle RPC failed, using separate queries: {e}")
+        return None
+
+
 # ==================== WELLNESS DATA ====================
 
 def get_wellness_data(user_id: str) -> Dict[str, Any]:
     """Get wellness metrics for user."""
-    moods = get_moods(user_id, period="week", limit=20)
-    activities = get_activities(user_id, period="week", limit=20)
+    moods = get_moods(user_id, period="week", limit=20, columns="rating")
+    activities = get_activities(user_id, period="week", limit=20, columns="activity_type,duration_minutes")
     
     # Calculate averages
     mood_counts = {}
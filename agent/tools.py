@@ -8,16 +8,29 @@ Mem0 is used only for semantic memory search.
 """
 
 import os
+import re
+import time
+import queue
+import atexit
 import asyncio
+import logging
+import threading
+import logging.handlers
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from google.adk.tools import ToolContext
+from google.adk.agents.callback_context import CallbackContext
+
+from agent.activity_discovery import get_activity_discovery
 
 # Import Supabase store for all data operations
 from agent.supabase_store import (
     # Profile
     save_profile,
-    get_profile,
+    get_cached_profile,
     # Expenses
     save_expense,
     get_expenses,
@@ -36,8 +49,21 @@ from agent.supabase_store import (
     get_alerts,
     # Wellness
     get_wellness_data,
+    get_daily_bundle,
 )
 
+# Tool errors are logged through a queue so the stream write happens on a
+# background thread instead of in the tool call.
+logger = logging.getLogger("amble.tools")
+_log_queue = queue.SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter("[%(name)s] %(levelname)s: %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+logger.propagate = False
+
 def _get_current_time() -> str:
     """Get current timestamp as ISO string"""
     return datetime.now().isoformat()
@@ -47,6 +73,77 @@ def _get_user_id(tool_context: ToolContext) -> str:
     return tool_context.state.get("user:id", "parent_user")
 
 
+# Background event loop for running async helpers from sync tools.
+# Reused across calls instead of creating and closing a loop each time.
+_BG_LOOP = asyncio.new_event_loop()
+threading.Thread(target=_BG_LOOP.run_forever, name="amble-tools-loop", daemon=True).start()
+
+def _run_async(coro, timeout: float = 30):
+    """Run a coroutine on the background loop and wait for its result."""
+    future = asyncio.run_coroutine_threadsafe(coro, _BG_LOOP)
+    try:
+        return future.result(timeout)
+    except FuturesTimeoutError:
+        # Don't leave the coroutine running on the loop after giving up on it
+        future.cancel()
+        raise
+
+# Thread pool for issuing independent (blocking) Supabase queries concurrently
+_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="amble-tools")
+
+
+# ==================== SESSION PREFETCH ====================
+
+# State keys for data prefetched on the first turn of a session (turn-scoped)
+_PROFILE_KEY = "temp:profile"
+_LATEST_MOOD_KEY = "temp:latest_mood"
+_WEEK_WELLNESS_KEY = "temp:week_wellness"
+_PREFETCHED_KEY = "session_prefetched"
+
+
+async def prefetch_session_data(callback_context: CallbackContext) -> None:
+    """
+    Prefetches profile, today's latest mood and this week's wellness data into
+    turn-scoped state on the first turn of a session. Later turns load
+    these lazily through _cached when a tool needs them.
+    """
+    if callback_context.state.get(_PREFETCHED_KEY):
+        return
+    
+    user_id = _get_user_id(callback_context)
+    
+    try:
+        profile, latest_mood, week_wellness = await asyncio.gather(
+            asyncio.to_thread(get_cached_profile, user_id),
+            asyncio.to_thread(_get_latest_mood, user_id),
+            asyncio.to_thread(get_wellness_data, user_id),
+        )
+    except Exception as e:
+        logger.warning("Failed to prefetch session data: %s", e)
+        for key in (_PROFILE_KEY, _LATEST_MOOD_KEY, _WEEK_WELLNESS_KEY):
+            callback_context.state[key] = None
+        return
+    
+    callback_context.state[_PROFILE_KEY] = profile
+    callback_context.state[_LATEST_MOOD_KEY] = latest_mood
+    callback_context.state[_WEEK_WELLNESS_KEY] = week_wellness
+    callback_context.state[_PREFETCHED_KEY] = True
+
+
+def _get_latest_mood(user_id: str) -> List[Dict[str, Any]]:
+    """Get today's most recent mood entry (rating and notes only)."""
+    return get_moods(user_id, period="today", limit=1, columns="rating,notes")
+
+
+def _cached(tool_context: ToolContext, key: str, loader):
+    """Get a prefetched value from state, loading and storing it on a miss."""
+    value = tool_context.state.get(key)
+    if value is None:
+        value = loader()
+        tool_context.state[key] = value
+    return value
+
+
 # ==================== USER PROFILE TOOLS ====================
 
 def update_user_profile(
@@ -81,6 +178,7 @@ def update_user_profile(
     
     # Update state for prompts
     if tool_context:
+        tool_context.state[_PROFILE_KEY] = None
         tool_context.state["user:profile"] = profile
         tool_context.state["user:name"] = name
         tool_context.state["user:location"] = location
@@ -96,7 +194,7 @@ def update_user_profile(
 def get_user_profile(tool_context: ToolContext) -> dict:
     """Retrieves the current user profile from Supabase."""
     user_id = _get_user_id(tool_context)
-    profile = get_profile(user_id)
+    profile = _cached(tool_context, _PROFILE_KEY, lambda: get_cached_profile(user_id))
     
     if not profile:
         return {
@@ -131,7 +229,7 @@ def track_expense(
     save_expense(user_id, amount, category, description)
     
     # Get today's total
-    today_expenses = get_expenses(user_id, period="today")
+    today_expenses = get_expenses(user_id, period="today", columns="amount")
     today_total = sum(e.get("amount", 0) for e in today_expenses)
     
     return {
@@ -155,22 +253,21 @@ def get_expense_summary(
         dict: Expense summary with breakdown by category
     """
     user_id = _get_user_id(tool_context)
-    expenses = get_expenses(user_id, period=period)
+    expenses = get_expenses(user_id, period=period, columns="category,amount")
     
     # Group by category
-    by_category = {}
+    by_category = Counter()
     total = 0
     for e in expenses:
-        cat = e.get("category", "other")
         amt = float(e.get("amount", 0) or 0)
-        by_category[cat] = by_category.get(cat, 0) + amt
+        by_category[e.get("category", "other")] += amt
         total += amt
     
     return {
         "status": "success",
         "period": period,
         "total": total,
-        "by_category": by_category,
+        "by_category": dict(by_category),
         "transaction_count": len(expenses),
         "message": f"Your {period}'s expenses total ₹{total:.2f} across {len(expenses)} transactions."
     }
@@ -191,21 +288,22 @@ def analyze_spending_patterns(
     """
     user_id = _get_user_id(tool_context)
     
-    # Get expenses for this month and last month
-    this_month = get_expenses(user_id, period="month")
-    all_expenses = get_expenses(user_id, limit=100)
+    # Get expenses for this month
+    this_month = get_expenses(user_id, period="month", columns="category,amount,description")
     
     insights = []
     recommendations = []
     
     # Calculate totals by category
-    by_category = {}
+    by_category = Counter()
     total = 0
+    largest = None  # (amount, expense) of the biggest single transaction
     for e in this_month:
-        cat = e.get("category", "other")
         amt = float(e.get("amount", 0) or 0)
-        by_category[cat] = by_category.get(cat, 0) + amt
+        by_category[e.get("category", "other")] += amt
         total += amt
+        if largest is None or amt > largest[0]:
+            largest = (amt, e)
     
     # Find top spending category
     if by_category:
@@ -225,14 +323,12 @@ def analyze_spending_patterns(
             })
     
     # Check for unusual single transactions
-    for e in this_month:
-        amt = float(e.get("amount", 0) or 0)
-        if amt > total * 0.3 and total > 0:  # Single expense > 30% of total
-            insights.append({
-                "type": "large_expense",
-                "message": f"Large expense detected: ₹{amt:.0f} for {e.get('description', e.get('category', 'unknown'))}"
-            })
-            break
+    if largest and total > 0 and largest[0] > total * 0.3:  # Single expense > 30% of total
+        amt, e = largest
+        insights.append({
+            "type": "large_expense",
+            "message": f"Large expense detected: ₹{amt:.0f} for {e.get('description', e.get('category', 'unknown'))}"
+        })
     
     # Compare to typical spending
     daily_avg = total / 30 if total > 0 else 0
@@ -245,13 +341,54 @@ def analyze_spending_patterns(
     return {
         "status": "success",
         "total_this_month": total,
-        "by_category": by_category,
+        "by_category": dict(by_category),
         "insights": insights,
         "recommendations": recommendations,
         "summary": f"You've spent ₹{total:.0f} this month across {len(this_month)} transactions."
     }
 
 
+# Activity suggestions by interest, used by suggest_daily_activity
+_ACTIVITY_MAP = {
+    "walking": [
+        {"name": "Morning walk in the park", "type": "exercise", "duration": 30},
+        {"name": "Evening stroll around the colony", "type": "exercise", "duration": 20}
+    ],
+    "yoga": [
+        {"name": "Gentle yoga stretches", "type": "exercise", "duration": 20},
+        {"name": "Breathing exercises (pranayama)", "type": "wellness", "duration": 15}
+    ],
+    "reading": [
+        {"name": "Read a chapter of your book", "type": "leisure", "duration": 30},
+        {"name": "Browse the newspaper", "type": "leisure", "duration": 20}
+    ],
+    "gardening": [
+        {"name": "Water and tend to plants", "type": "hobby", "duration": 20},
+        {"name": "Repot a plant or add fertilizer", "type": "hobby", "duration": 30}
+    ],
+    "cooking": [
+        {"name": "Try a new recipe", "type": "hobby", "duration": 45},
+        {"name": "Prepare a special chai", "type": "leisure", "duration": 15}
+    ],
+    "music": [
+        {"name": "Listen to classical ragas", "type": "leisure", "duration": 30},
+        {"name": "Hum along to favorite bhajans", "type": "leisure", "duration": 20}
+    ],
+    "temple": [
+        {"name": "Morning prayers at home", "type": "spiritual", "duration": 15},
+        {"name": "Visit the neighborhood temple", "type": "spiritual", "duration": 30}
+    ],
+    "socializing": [
+        {"name": "Call a friend or relative", "type": "social", "duration": 20},
+        {"name": "Tea time with neighbors", "type": "social", "duration": 30}
+    ],
+    "grandchildren": [
+        {"name": "Video call with grandchildren", "type": "social", "duration": 20},
+        {"name": "Write a letter to grandchildren", "type": "leisure", "duration": 20}
+    ]
+}
+
+
 def suggest_daily_activity(
     tool_context: ToolContext
 ) -> dict:
@@ -265,70 +402,31 @@ def suggest_daily_activity(
     Returns:
         dict: Activity suggestions tailored to the user
     """
-    from agent.supabase_store import get_profile
-    
     user_id = _get_user_id(tool_context)
     
     # Get user profile and interests
-    profile = get_profile(user_id) or {}
+    profile = _cached(tool_context, _PROFILE_KEY, lambda: get_cached_profile(user_id)) or {}
     interests = profile.get("interests", [])
     
     # Get recent activities to avoid repetition
-    recent = get_activities(user_id, limit=7)
+    recent = get_activities(user_id, limit=7, columns="activity_type")
     recent_types = {a.get("activity_type") for a in recent}
     
-    # Define activity suggestions by interest
-    activity_map = {
-        "walking": [
-            {"name": "Morning walk in the park", "type": "exercise", "duration": 30},
-            {"name": "Evening stroll around the colony", "type": "exercise", "duration": 20}
-        ],
-        "yoga": [
-            {"name": "Gentle yoga stretches", "type": "exercise", "duration": 20},
-            {"name": "Breathing exercises (pranayama)", "type": "wellness", "duration": 15}
-        ],
-        "reading": [
-            {"name": "Read a chapter of your book", "type": "leisure", "duration": 30},
-            {"name": "Browse the newspaper", "type": "leisure", "duration": 20}
-        ],
-        "gardening": [
-            {"name": "Water and tend to plants", "type": "hobby", "duration": 20},
-            {"name": "Repot a plant or add fertilizer", "type": "hobby", "duration": 30}
-        ],
-        "cooking": [
-            {"name": "Try a new recipe", "type": "hobby", "duration": 45},
-            {"name": "Prepare a special chai", "type": "leisure", "duration": 15}
-        ],
-        "music": [
-            {"name": "Listen to classical ragas", "type": "leisure", "duration": 30},
-            {"name": "Hum along to favorite bhajans", "type": "leisure", "duration": 20}
-        ],
-        "temple": [
-            {"name": "Morning prayers at home", "type": "spiritual", "duration": 15},
-            {"name": "Visit the neighborhood temple", "type": "spiritual", "duration": 30}
-        ],
-        "socializing": [
-            {"name": "Call a friend or relative", "type": "social", "duration": 20},
-            {"name": "Tea time with neighbors", "type": "social", "duration": 30}
-        ],
-        "grandchildren": [
-            {"name": "Video call with grandchildren", "type": "social", "duration": 20},
-            {"name": "Write a letter to grandchildren", "type": "leisure", "duration": 20}
-        ]
-    }
-    
     # Get time-appropriate greeting
     hour = datetime.now().hour
     time_context = "morning" if hour < 12 else "afternoon" if hour < 17 else "evening"
     
-    # Find suitable suggestions
+    # Find suitable suggestions, stopping once we have two
     suggestions = []
     for interest in interests:
-        if interest in activity_map:
-            for activity in activity_map[interest]:
-                # Prefer activities not done recently
-                if activity["type"] not in recent_types:
-                    suggestions.append(activity)
+        for activity in _ACTIVITY_MAP.get(interest, ()):
+            # Prefer activities not done recently
+            if activity["type"] not in recent_types:
+                suggestions.append(activity)
+                if len(suggestions) >= 2:
+                    break
+        if len(suggestions) >= 2:
+            break
     
     # Default suggestions if no interests match
     if not suggestions:
@@ -352,6 +450,34 @@ def suggest_daily_activity(
 
 # ==================== MOOD TRACKING TOOLS ====================
 
+_MOOD_RESPONSES = {
+    "happy": "That's wonderful to hear! Your happiness brightens my day too.",
+    "content": "A peaceful contentment is a lovely state to be in. Cherish it.",
+    "neutral": "Thank you for sharing. Sometimes a calm, neutral day is just what we need.",
+    "tired": "Rest is important, my dear. Perhaps a gentle nap or some quiet time would do you good.",
+    "sad": "I'm here for you. Sadness is a natural feeling. Would you like to talk about it?",
+    "anxious": "Take a deep breath with me. Remember, you're not alone. I'm right here.",
+    "lonely": "I understand. Connection matters. Perhaps we could plan a call with someone you love?",
+    "energetic": "How splendid! That energy is wonderful. Any activities planned?",
+    "grateful": "Gratitude is such a beautiful feeling. What are you grateful for today?"
+}
+
+_DEFAULT_MOOD_REPLY = "Thank you for sharing how you're feeling with me."
+
+# Moods counted towards a positive or negative trend
+_POSITIVE_MOODS = frozenset({"happy", "content", "energetic", "grateful"})
+_NEGATIVE_MOODS = frozenset({"sad", "anxious", "lonely", "tired"})
+
+# Energy level is stored in mood notes as "Energy: N/10"
+_ENERGY_RE = re.compile(r"Energy:\s*(\d+)")
+
+
+@lru_cache(maxsize=32)
+def _mood_response(mood: str) -> str:
+    """Get the empathetic reply for a mood (only a handful of moods are common)."""
+    return _MOOD_RESPONSES.get(mood.lower(), _DEFAULT_MOOD_REPLY)
+
+
 def track_mood(
     tool_context: ToolContext,
     mood: str,
@@ -374,22 +500,12 @@ def track_mood(
     
     # Save to Supabase
     notes = f"{details} (Energy: {energy_level}/10)" if details else f"Energy: {energy_level}/10"
-    save_mood(user_id, mood, notes, energy_level)
+    save_mood(user_id, mood, notes, energy_level, buffered=True)
+    tool_context.state[_LATEST_MOOD_KEY] = None
+    tool_context.state[_WEEK_WELLNESS_KEY] = None
     
     # Generate empathetic response based on mood
-    mood_responses = {
-        "happy": "That's wonderful to hear! Your happiness brightens my day too.",
-        "content": "A peaceful contentment is a lovely state to be in. Cherish it.",
-        "neutral": "Thank you for sharing. Sometimes a calm, neutral day is just what we need.",
-        "tired": "Rest is important, my dear. Perhaps a gentle nap or some quiet time would do you good.",
-        "sad": "I'm here for you. Sadness is a natural feeling. Would you like to talk about it?",
-        "anxious": "Take a deep breath with me. Remember, you're not alone. I'm right here.",
-        "lonely": "I understand. Connection matters. Perhaps we could plan a call with someone you love?",
-        "energetic": "How splendid! That energy is wonderful. Any activities planned?",
-        "grateful": "Gratitude is such a beautiful feeling. What are you grateful for today?"
-    }
-    
-    response = mood_responses.get(mood.lower(), "Thank you for sharing how you're feeling with me.")
+    response = _mood_response(mood)
     
     return {
         "status": "success",
@@ -415,31 +531,22 @@ def get_mood_history(
     """
     user_id = _get_user_id(tool_context)
     period = "week" if days <= 7 else "all"
-    moods = get_moods(user_id, period=period, limit=50)
+    moods = get_moods(user_id, period=period, limit=50, columns="rating,notes")
     
     # Analyze trends
-    mood_counts = {}
+    mood_counts = Counter(m.get("rating", "neutral") for m in moods)
     avg_energy = 0
     for m in moods:
-        mood = m.get("rating", "neutral")
-        mood_counts[mood] = mood_counts.get(mood, 0) + 1
         # Extract energy from notes if stored there
-        notes = m.get("notes", "")
-        if "Energy:" in notes:
-            try:
-                energy = int(notes.split("Energy:")[1].split("/")[0].strip())
-                avg_energy += energy
-            except:
-                avg_energy += 5
-        else:
-            avg_energy += 5
+        match = _ENERGY_RE.search(m.get("notes") or "")
+        avg_energy += int(match.group(1)) if match else 5
     
     if moods:
         avg_energy /= len(moods)
     
     # Determine trend
-    positive_moods = sum(mood_counts.get(m, 0) for m in ["happy", "content", "energetic", "grateful"])
-    negative_moods = sum(mood_counts.get(m, 0) for m in ["sad", "anxious", "lonely", "tired"])
+    positive_moods = sum(mood_counts[m] for m in _POSITIVE_MOODS)
+    negative_moods = sum(mood_counts[m] for m in _NEGATIVE_MOODS)
     
     if positive_moods > negative_moods:
         trend = "positive"
@@ -451,7 +558,7 @@ def get_mood_history(
     return {
         "status": "success",
         "period_days": days,
-        "mood_counts": mood_counts,
+        "mood_counts": dict(mood_counts),
         "average_energy": round(avg_energy, 1),
         "trend": trend,
         "total_entries": len(moods)
@@ -484,7 +591,8 @@ def record_activity(
     
     # Save to Supabase - description includes both name and notes
     description = f"{activity_name}: {notes}" if notes else activity_name
-    save_activity(user_id, activity_type.lower(), description, duration_minutes)
+    save_activity(user_id, activity_type.lower(), description, duration_minutes, buffered=True)
+    tool_context.state[_WEEK_WELLNESS_KEY] = None
     
     # Generate encouraging response
     active_types = ["walking", "exercise", "gardening", "shopping"]
@@ -524,24 +632,22 @@ def get_activity_history(
     """
     user_id = _get_user_id(tool_context)
     period = "week" if days <= 7 else "all"
-    activities = get_activities(user_id, period=period, limit=100)
+    activities = get_activities(user_id, period=period, limit=100, columns="activity_type,duration_minutes")
     
     # Summarize by type
-    by_type = {}
+    by_type = defaultdict(lambda: {"count": 0, "total_minutes": 0})
     total_minutes = 0
     for a in activities:
-        atype = a.get("activity_type", "other")
         duration = a.get("duration_minutes", 0)
-        if atype not in by_type:
-            by_type[atype] = {"count": 0, "total_minutes": 0}
-        by_type[atype]["count"] += 1
-        by_type[atype]["total_minutes"] += duration
+        summary = by_type[a.get("activity_type", "other")]
+        summary["count"] += 1
+        summary["total_minutes"] += duration
         total_minutes += duration
     
     return {
         "status": "success",
         "period_days": days,
-        "by_type": by_type,
+        "by_type": dict(by_type),
         "total_activities": len(activities),
         "total_active_minutes": total_minutes
     }
@@ -580,7 +686,7 @@ def schedule_appointment(
         dt = datetime.fromisoformat(date_time)
         date_part = dt.strftime("%Y-%m-%d")
         time_part = dt.strftime("%H:%M")
-    except:
+    except ValueError:
         date_part = date_time.split(" ")[0] if " " in date_time else date_time
         time_part = date_time.split(" ")[1] if " " in date_time else "12:00"
     
@@ -623,22 +729,24 @@ def get_upcoming_appointments(
     
     upcoming = []
     for apt in appointments:
+        # Combine date and time
+        apt_date = apt.get("date", "")
+        apt_time = apt.get("time", "12:00")
+        if not apt_date:
+            continue
         try:
-            # Combine date and time
-            apt_date = apt.get("date", "")
-            apt_time = apt.get("time", "12:00")
             apt_datetime = datetime.fromisoformat(f"{apt_date} {apt_time}")
-            if now <= apt_datetime <= future_limit:
-                # Format for response
-                upcoming.append({
-                    "id": apt.get("id"),
-                    "title": apt.get("title"),
-                    "date_time": f"{apt_date} {apt_time}",
-                    "location": apt.get("location"),
-                    "description": apt.get("description", "")
-                })
-        except:
+        except ValueError:
             continue
+        if now <= apt_datetime <= future_limit:
+            # Format for response
+            upcoming.append({
+                "id": apt.get("id"),
+                "title": apt.get("title"),
+                "date_time": f"{apt_date} {apt_time}",
+                "location": apt.get("location"),
+                "description": apt.get("description", "")
+            })
     
     # Sort by date
     upcoming.sort(key=lambda x: x["date_time"])
@@ -712,7 +820,7 @@ def analyze_wellness_patterns(
     user_id = _get_user_id(tool_context)
     
     # Get data from Supabase using the wellness helper
-    wellness_data = get_wellness_data(user_id)
+    wellness_data = _cached(tool_context, _WEEK_WELLNESS_KEY, lambda: get_wellness_data(user_id))
     
     insights = []
     concerns = []
@@ -760,14 +868,10 @@ def analyze_wellness_patterns(
     avg_energy = 5
     energy_count = 0
     for m in recent_moods:
-        notes = m.get("notes", "")
-        if "Energy:" in notes:
-            try:
-                energy = int(notes.split("Energy:")[1].split("/")[0].strip())
-                avg_energy += energy
-                energy_count += 1
-            except:
-                pass
+        match = _ENERGY_RE.search(m.get("notes") or "")
+        if match:
+            avg_energy += int(match.group(1))
+            energy_count += 1
     if energy_count > 0:
         avg_energy = avg_energy / energy_count
         if avg_energy < 4:
@@ -781,13 +885,14 @@ def analyze_wellness_patterns(
     # Check routine consistency
     days_with_activity = set()
     for a in recent_activities:
+        timestamp = a.get("timestamp", "")
+        if not timestamp or len(timestamp) < 10:
+            continue
         try:
-            timestamp = a.get("timestamp", "")
-            if timestamp:
-                day = datetime.fromisoformat(timestamp).date()
-                days_with_activity.add(day)
-        except:
+            day = datetime.fromisoformat(timestamp).date()
+        except ValueError:
             continue
+        days_with_activity.add(day)
     
     if len(days_with_activity) < 4:
         concerns.append({
@@ -883,8 +988,8 @@ def get_activity_suggestions(
     user_id = _get_user_id(tool_context)
     
     now = datetime.now()
-    profile = get_profile(user_id) or {}
-    moods = get_moods(user_id, period="today", limit=1)
+    profile = _cached(tool_context, _PROFILE_KEY, lambda: get_cached_profile(user_id)) or {}
+    moods = _cached(tool_context, _LATEST_MOOD_KEY, lambda: _get_latest_mood(user_id))
     last_mood = moods[0].get("rating", "unknown") if moods else "unknown"
     
     # Parse interests from profile if stored
@@ -904,6 +1009,24 @@ def get_activity_suggestions(
     }
 
 
+# Fallback suggestions when activity discovery is unavailable
+_FALLBACK_ACTIVITY_SUGGESTIONS = (
+    "Take a walk in a nearby park",
+    "Visit the local senior center",
+    "Join a community yoga class",
+    "Attend a religious service",
+    "Check with your housing society for events",
+)
+
+_FALLBACK_MOOD_SUGGESTIONS = (
+    "Take a gentle walk",
+    "Listen to some music",
+    "Call a loved one",
+    "Do some light stretching",
+    "Read a book or magazine",
+)
+
+
 def search_local_activities(
     tool_context: ToolContext,
     activity_type: str = "community",
@@ -922,38 +1045,22 @@ def search_local_activities(
         dict: List of local activities and events
     """
     user_id = _get_user_id(tool_context)
-    profile = get_profile(user_id) or {}
+    profile = _cached(tool_context, _PROFILE_KEY, lambda: get_cached_profile(user_id)) or {}
     
     location = profile.get("location", "your area")
     interests = profile.get("interests", [])
     
     try:
-        from agent.activity_discovery import get_activity_discovery
         discovery = get_activity_discovery()
         
         # Run async function synchronously
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            result = loop.run_until_complete(
-                discovery.search_local_events(location, interests, activity_type)
-            )
-        finally:
-            loop.close()
-        
-        return result
+        return _run_async(discovery.search_local_events(location, interests, activity_type))
     except Exception as e:
-        print(f"[Activity Discovery Error] {e}")
+        logger.warning("Activity discovery failed: %s", e)
         return {
             "status": "error",
             "message": "I couldn't search for activities right now. Let me suggest some general options.",
-            "suggestions": [
-                "Take a walk in a nearby park",
-                "Visit the local senior center",
-                "Join a community yoga class",
-                "Attend a religious service",
-                "Check with your housing society for events"
-            ]
+            "suggestions": list(_FALLBACK_ACTIVITY_SUGGESTIONS)
         }
 
 
@@ -972,39 +1079,24 @@ def get_mood_based_suggestions(
     user_id = _get_user_id(tool_context)
     
     # Get latest mood
-    moods = get_moods(user_id, period="today", limit=1)
+    moods = _cached(tool_context, _LATEST_MOOD_KEY, lambda: _get_latest_mood(user_id))
     if moods:
         mood = moods[0].get("rating", "okay")
-        energy = moods[0].get("energy_level", 5)
+        match = _ENERGY_RE.search(moods[0].get("notes") or "")
+        energy = int(match.group(1)) if match else 5
     else:
         mood = "okay"
         energy = 5
     
     try:
-        from agent.activity_discovery import get_activity_discovery
         discovery = get_activity_discovery()
         
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            result = loop.run_until_complete(
-                discovery.get_activity_for_mood(mood, energy)
-            )
-        finally:
-            loop.close()
-        
-        return result
+        return _run_async(discovery.get_activity_for_mood(mood, energy))
     except Exception as e:
-        print(f"[Mood Suggestions Error] {e}")
+        logger.warning("Mood-based suggestions failed: %s", e)
         return {
             "status": "success",
-            "suggestions": [
-                "Take a gentle walk",
-                "Listen to some music",
-                "Call a loved one",
-                "Do some light stretching",
-                "Read a book or magazine"
-            ],
+            "suggestions": list(_FALLBACK_MOOD_SUGGESTIONS),
             "message": "Here are some activities you might enjoy!"
         }
 
@@ -1022,20 +1114,40 @@ def get_daily_summary(
         dict: Daily summary
     """
     user_id = _get_user_id(tool_context)
-    today = datetime.now().date().isoformat()
     
-    # Get today's data from Supabase
-    activities = get_activities(user_id, period="today", limit=50)
-    moods = get_moods(user_id, period="today", limit=50)
-    expenses = get_expenses(user_id, period="today")
+    # Today's range is computed once and passed down as explicit bounds
+    today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    since = today_start.isoformat()
+    until = (today_start + timedelta(days=1)).isoformat()
+    today = today_start.date().isoformat()
+    
+    # Get today's data from Supabase in one RPC, or three concurrent queries
+    bundle = get_daily_bundle(user_id, since=since, until=until)
+    if bundle is not None:
+        activities, moods, expenses = bundle["activities"], bundle["moods"], bundle["expenses"]
+    else:
+        fa = _POOL.submit(get_activities, user_id, limit=50, columns="duration_minutes", since=since, until=until)
+        fm = _POOL.submit(get_moods, user_id, limit=50, columns="rating", since=since, until=until)
+        fe = _POOL.submit(get_expenses, user_id, columns="amount", since=since, until=until)
+        activities, moods, expenses = fa.result(), fm.result(), fe.result()
+    
+    # One pass over each list for all of its totals
+    total_expenses = 0
+    for e in expenses:
+        total_expenses += e.get("amount") or 0
+    
+    total_active_minutes = 0
+    for a in activities:
+        total_active_minutes += a.get("duration_minutes") or 0
     
-    total_expenses = sum(e.get("amount", 0) for e in expenses)
-    total_active_minutes = sum(a.get("duration_minutes", 0) for a in activities)
+    positive = negative = 0
+    for m in moods:
+        rating = m.get("rating")
+        positive += rating in _POSITIVE_MOODS
+        negative += rating in _NEGATIVE_MOODS
     
     # Determine mood trend
     if moods:
-        positive = sum(1 for m in moods if m.get("rating") in ["happy", "content", "energetic", "grateful"])
-        negative = sum(1 for m in moods if m.get("rating") in ["sad", "anxious", "lonely", "tired"])
         if positive > negative:
             mood_trend = "positive"
         elif negative > positive:
@@ -1059,6 +1171,26 @@ def get_daily_summary(
 
 # ==================== LONG-TERM MEMORY TOOLS (Mem0) ====================
 
+@lru_cache(maxsize=1)
+def _get_mem0_client():
+    """Get the shared Mem0 client so its HTTP connections are reused."""
+    from mem0 import MemoryClient
+    return MemoryClient(api_key=os.getenv("MEM0_API_KEY"))
+
+
+# Recent recall results ((user_id, query, category) -> (results, expires_at)).
+# remember_fact drops a user's entries so new facts show up immediately.
+_MEM0_CACHE_TTL = 60
+_MEM0_CACHE_MAX = 2048
+_mem0_result_cache: Dict[tuple, tuple] = {}
+
+def _invalidate_memories(user_id: str) -> None:
+    """Drop cached recall results for a user."""
+    # Iterate over a snapshot; other threads may be filling the cache
+    for key in [k for k in list(_mem0_result_cache) if k[0] == user_id]:
+        _mem0_result_cache.pop(key, None)
+
+
 def remember_fact(
     tool_context: ToolContext,
     fact: str,
@@ -1083,19 +1215,18 @@ def remember_fact(
     
     # Use Mem0 for semantic memory storage
     try:
-        from mem0 import MemoryClient
-        mem0_client = MemoryClient()
+        mem0_client = _get_mem0_client()
         
-        # Add memory with category metadata
-        memory_text = f"[{category}] {fact}"
-        mem0_client.add(memory_text, user_id=user_id)
+        # Add memory with category metadata so recall can filter on it server-side
+        mem0_client.add(fact, user_id=user_id, metadata={"category": category})
+        _invalidate_memories(user_id)
         
         return {
             "status": "success",
             "message": f"I've made a note of that: {fact}"
         }
     except Exception as e:
-        print(f"[Mem0 Error] Failed to store memory: {e}")
+        logger.warning("Mem0 store failed: %s", e)
         # Fallback - just acknowledge without persisting
         return {
             "status": "noted",
@@ -1122,42 +1253,62 @@ def recall_memories(
     user_id = _get_user_id(tool_context)
     
     try:
-        from mem0 import MemoryClient
-        import os
-        api_key = os.getenv("MEM0_API_KEY")
-        if not api_key:
+        if not os.getenv("MEM0_API_KEY"):
             return {"status": "success", "memories": [], "count": 0}
         
-        mem0_client = MemoryClient(api_key=api_key)
-
-        # Search memories - Mem0 API v2 requires filters as a dictionary parameter
-        search_query = query if query else "user preferences and personal information"
-        memories_result = mem0_client.search(
-            query=search_query,
-            filters={"user_id": user_id},
-            top_k=10
-        )
+        cache_key = (user_id, query, category)
+        cached = _mem0_result_cache.get(cache_key)
+        if cached and cached[1] > time.monotonic():
+            results = cached[0]
+            return {
+                "status": "success",
+                "memories": results,
+                "count": len(results)
+            }
+        
+        mem0_client = _get_mem0_client()
+
+        # Mem0 API v2 requires filters as a dictionary parameter
+        if not query and not category:
+            # Nothing to search for - list recent memories without an embedding lookup
+            memories_result = mem0_client.get_all(
+                filters={"user_id": user_id},
+                page=1,
+                page_size=10
+            )
+            if isinstance(memories_result, dict):
+                memories_result = memories_result.get("results", [])
+        else:
+            search_query = query if query else "user preferences and personal information"
+            filters = {"user_id": user_id}
+            if category:
+                filters = {"AND": [filters, {"metadata": {"category": category}}]}
+            memories_result = mem0_client.search(
+                query=search_query,
+                filters=filters,
+                top_k=10
+            )
         
         results = []
         if memories_result:
             for mem in memories_result:
-                memory_text = mem.get("memory", "")
-                # Filter by category if specified
-                if category:
-                    if not memory_text.startswith(f"[{category}]"):
-                        continue
                 results.append({
-                    "fact": memory_text,
+                    "fact": mem.get("memory", ""),
                     "relevance": mem.get("score", 0)
                 })
         
+        if len(_mem0_result_cache) >= _MEM0_CACHE_MAX:
+            # Evict the oldest entry (dicts keep insertion order)
+            _mem0_result_cache.pop(next(iter(_mem0_result_cache), None), None)
+        _mem0_result_cache[cache_key] = (results, time.monotonic() + _MEM0_CACHE_TTL)
+        
         return {
             "status": "success",
             "memories": results,
             "count": len(results)
         }
     except Exception as e:
-        print(f"[Mem0 Error] Failed to recall memories: {e}")
+        logger.warning("Mem0 recall failed: %s", e)
         return {
             "status": "success",
             "memories": [],
@@ -1188,25 +1339,13 @@ def initiate_video_call(
     user_id = _get_user_id(tool_context)
     user_name = tool_context.state.get("user:name", "User")
     
-    # Log the call request as a social activity
-    save_activity(user_id, {
-        "activity_type": "phone_call",
-        "description": f"Video call with {contact_name}",
-        "duration": 0,  # Will be updated when call ends
-        "timestamp": _get_current_time(),
-        "call_type": "video",
-        "contact": contact_name
-    })
-    
-    # Create an alert for family members so they know to join
-    save_alert(user_id, {
-        "alert_type": "video_call_request",
-        "message": f"{user_name} wants to video call with {contact_name}",
-        "urgency": "medium",
-        "timestamp": _get_current_time(),
-        "read": False,
-        "contact_requested": contact_name
-    })
+    # Log the call request as a social activity and create an alert for
+    # family members so they know to join; both writes run concurrently
+    activity = _POOL.submit(save_activity, user_id, "phone_call", f"Video call with {contact_name}", 0)
+    alert = _POOL.submit(save_alert, user_id, "video_call_request", f"{user_name} wants to video call with {contact_name}")
+    activity.result()
+    alert.result()
+    tool_context.state[_WEEK_WELLNESS_KEY] = None
     
     return {
         "status": "success",
@@ -1249,7 +1388,7 @@ def get_available_contacts(
         dict: List of contacts that can be called
     """
     user_id = _get_user_id(tool_context)
-    profile = get_profile(user_id) or {}
+    profile = _cached(tool_context, _PROFILE_KEY, lambda: get_cached_profile(user_id)) or {}
     
     # Get emergency contact as primary family contact
     emergency_name = profile.get("emergency_contact_name", "Family Member")
@@ -0,0 +1,30 @@
+-- One-round-trip daily summary used by agent/supabase_store.py get_daily_bundle().
+-- Returns only activities.duration_minutes, moods.rating and expenses.amount,
+-- at most 50 newest rows each, for the totals in get_daily_summary.
+-- Run once in the Supabase SQL editor. Without it the agent falls back to
+-- three separate queries.
+
+create or replace function get_daily_bundle(
+  p_user text,
+  p_since timestamp,
+  p_until timestamp default null
+)
+returns json language sql stable as $$
+  select json_build_object(
+    'activities', (select coalesce(json_agg(a), '[]'::json) from (
+        select duration_minutes from activities
+        where user_id = p_user and "timestamp" >= p_since
+          and (p_until is null or "timestamp" < p_until)
+        order by "timestamp" desc limit 50) a),
+    'moods', (select coalesce(json_agg(m), '[]'::json) from (
+        select rating from moods
+        where user_id = p_user and "timestamp" >= p_since
+          and (p_until is null or "timestamp" < p_until)
+        order by "timestamp" desc limit 50) m),
+    'expenses', (select coalesce(json_agg(e), '[]'::json) from (
+        select amount from expenses
+        where user_id = p_user and created_at >= p_since
+          and (p_until is null or created_at < p_until)
+        order by created_at desc limit 50) e)
+  );
+$$;